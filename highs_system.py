@@ -0,0 +1,289 @@
+import highspy
+
+
+# Desired belt balancer values for generating the model
+inbounds = 1  # Number of inbound belts
+outbounds = 3  # Number of outbound belts
+splitters = 3  # Number of splitters allowed
+
+
+# Output options
+verbose = False  # Print the full HiGHS solver log
+
+
+# Derived values for inbound and outbound traffic
+cargos = inbounds  # One unique homogeneous cargo type for each inbound belt
+throughput = min(inbounds, outbounds)  # Number of belts of throughput
+v_in = throughput / inbounds  # Total volume per inbound belt
+v_out = throughput / outbounds  # Total volume per outbound belt
+t_in = v_in / 1  # Inbound traffic per cargo per belt (homogeneous)
+t_out = v_out / cargos  # Outbound traffic per cargo per belt
+
+
+# Basic sets
+# Members are (kind, number) tuples, so no string parsing is needed
+# Sets are kept as lists, since they are only ever iterated over
+
+# Inbound belts to the balancer
+I = [('i', k + 1) for k in range(inbounds)]
+
+# Outbound belts from the balancer
+J = [('j', k + 1) for k in range(outbounds)]
+
+# Splitters within the balancer
+S = [('s', k + 1) for k in range(splitters)]
+
+# Unique cargo types for each inbound belt
+C = [('c', k + 1) for k in range(cargos)]
+
+
+# Composite sets
+
+# Possible belt starting points that can yield cargo
+P = I + S  # union
+
+# Possible belt ending points that can accept cargo
+Q = S + J  # union
+
+# Available belt routes within the balancer
+# Belts may not bypass the splitters entirely (no I x J routes)
+# A splitter may not loop right back on itself (no s_k -> s_k routes)
+B = (
+    [(i, s) for i in I for s in S]
+    + [(s, j) for s in S for j in J]
+    + [(s, r) for s in S for r in S if s != r]
+)
+
+# Adjacency lists of the belt routes, so sums need not scan all of B
+succs = {p: [] for p in P}  # Consuming ends reachable from each p
+preds = {q: [] for q in Q}  # Producing ends that can reach each q
+for p, q in B:
+    succs[p].append(q)
+    preds[q].append(p)
+
+# Cross product of inbound belts and cargo types
+IxC = [(i, c) for i in I for c in C]
+
+# Cross product of outbound belts and cargo types
+JxC = [(j, c) for j in J for c in C]
+
+# Cross product of splitters and cargo types
+SxC = [(s, c) for s in S for c in C]
+
+# Cross product of internal belts and cargo types
+BxC = [(p, q, c) for p, q in B for c in C]
+
+# Cross product of splitter output belts and cargo types
+SxQxC = [(s, q, c) for s in S for q in succs[s] for c in C]
+
+
+# Parameters
+
+# Homogeneous cargo traffic for each inbound belt
+def f_init(i, c):
+    if i[1] == c[1]:
+        return t_in
+    return 0
+f = {(i, c): f_init(i, c) for i, c in IxC}
+
+# Perfectly mixed cargo traffic for each outbound belt
+g = {(j, c): t_out for j, c in JxC}
+
+# Upper bound on the traffic flowing along any belt
+u_t = 1
+assert u_t > 0
+
+# Upper bound on the traffic flowing into any splitter
+u_x = 2
+assert u_x > 0
+
+
+# Variables
+
+system = highspy.Highs()
+system.setOptionValue("output_flag", verbose)
+inf = highspy.kHighsInf
+
+# Add one column to the system and return its index
+def add_var(lower=0, upper=inf, integer=False):
+    col = system.getNumCol()
+    system.addVar(lower, upper)
+    if integer:
+        system.changeColIntegrality(col, highspy.HighsVarType.kInteger)
+    return col
+
+# Add one row to the system from a dict of {column: coefficient} terms
+# Building each row as a dict and adding it in one call is much cheaper
+# than accumulating a linear expression one term at a time
+def add_row(terms, lower=-inf, upper=inf):
+    system.addRow(lower, upper, len(terms), list(terms), list(terms.values()))
+
+# Decision variable indicating whether a belt exists
+e = {(p, q): add_var(upper=1, integer=True) for p, q in B}
+
+# Fraction of belt capacity occupied by one cargo type
+t = {(p, q, c): add_var(upper=1) for p, q, c in BxC}
+
+# Total occupied fraction of belt capacity
+v = {(p, q): add_var(upper=1) for p, q in B}
+
+# Number of belts running into each splitter
+n = {s: add_var(integer=True) for s in S}
+
+# Number of belts running out of each splitter
+m = {s: add_var(integer=True) for s in S}
+
+# Sum of traffic flowing into each splitter by cargo
+x = {(s, c): add_var() for s, c in SxC}
+
+# Sum of traffic flowing out of each splitter by cargo
+y = {(s, c): add_var() for s, c in SxC}
+
+# Indicator variable for splitters that have two outputs
+z = {s: add_var(upper=1, integer=True) for s in S}
+
+# Product of the variables x[s, c] and e[s, q]
+xe = {(s, q, c): add_var() for s, q, c in SxQxC}
+
+# Product of the variables t[s, q, c] and z[s]
+tz = {(s, q, c): add_var(upper=1) for s, q, c in SxQxC}
+
+
+# Volume definition constraint
+# Define belt volume as the sum over all cargo
+for p, q in B:
+    terms = {t[p, q, c]: -1 for c in C}
+    terms[v[p, q]] = 1
+    add_row(terms, 0, 0)
+
+
+# Constraints defining number of splitter input/output belts
+
+# Define the number of input belts to a splitter with a sum
+for s in S:
+    terms = {e[p, s]: -1 for p in preds[s]}
+    terms[n[s]] = 1
+    add_row(terms, 0, 0)
+
+# Define the number of output belts to a splitter with a sum
+for s in S:
+    terms = {e[s, q]: -1 for q in succs[s]}
+    terms[m[s]] = 1
+    add_row(terms, 0, 0)
+
+
+# Constraints defining splitter inflow/outflow traffic by cargo
+
+# Define splitter inflow as the sum over all input belts
+for s, c in SxC:
+    terms = {t[p, s, c]: -1 for p in preds[s]}
+    terms[x[s, c]] = 1
+    add_row(terms, 0, 0)
+
+# Define splitter outflow as the sum over all output belts
+for s, c in SxC:
+    terms = {t[s, q, c]: -1 for q in succs[s]}
+    terms[y[s, c]] = 1
+    add_row(terms, 0, 0)
+
+
+# Trick constraints to force xe[s, q, c] == x[s, c] * e[s, q]
+# See section 7.7 of the AIMMS PDF in this directory for more details
+for s, q, c in SxQxC:
+    add_row({xe[s, q, c]: 1, e[s, q]: -u_x}, upper=0)
+    add_row({xe[s, q, c]: 1, x[s, c]: -1}, upper=0)
+    add_row({xe[s, q, c]: 1, x[s, c]: -1, e[s, q]: -u_x}, lower=-u_x)
+
+
+# Trick constraints to force tz[s, q, c] == t[s, q, c] * z[s]
+# See section 7.7 of the AIMMS PDF in this directory for more details
+for s, q, c in SxQxC:
+    add_row({tz[s, q, c]: 1, z[s]: -u_t}, upper=0)
+    add_row({tz[s, q, c]: 1, t[s, q, c]: -1}, upper=0)
+    add_row({tz[s, q, c]: 1, t[s, q, c]: -1, z[s]: -u_t}, lower=-u_t)
+
+
+# Inbound/outbound connectedness constraints
+
+# Balancer must connect all inbound belts exactly once
+for i in I:
+    add_row({e[i, q]: 1 for q in succs[i]}, 1, 1)
+
+# Balancer must connect all outbound belts exactly once
+for j in J:
+    add_row({e[p, j]: 1 for p in preds[j]}, 1, 1)
+
+
+# Inbound/outbound balanced traffic constraints
+
+# Balancer must consume all inbound traffic
+for i, c in IxC:
+    add_row({t[i, q, c]: 1 for q in succs[i]}, f[i, c], f[i, c])
+
+# Balancer must produce expected outbound traffic
+for j, c in JxC:
+    add_row({t[p, j, c]: 1 for p in preds[j]}, g[j, c], g[j, c])
+
+
+# Belt capacity/connectedness constraint
+# Ensure belt volume is limited by capacity and connectedness
+for p, q in B:
+    add_row({v[p, q]: 1, e[p, q]: -1}, upper=0)
+
+
+# Splitter cargo conservation constraint
+# Splitters do not create cargo or destroy cargo
+for s, c in SxC:
+    add_row({x[s, c]: 1, y[s, c]: -1}, 0, 0)
+
+
+# Splitter connectedness constraints
+for s in S:
+
+    # Splitters with two output belts should have at least one input belt
+    add_row({n[s]: 1, z[s]: -1}, lower=0)
+
+    # Splitters can take at most two input belts
+    add_row({n[s]: 1}, upper=2)
+
+    # Splitters that are actually splitting must have two output belts
+    add_row({m[s]: 1, z[s]: -2}, lower=0)
+
+    # Splitters have one output belt unless they are actually splitting
+    add_row({m[s]: 1, z[s]: -1}, upper=1)
+
+
+# Constraint so that splitters split evenly
+# By far the most complex constraint here (because it's not actually linear)
+# Supposed to be equivalent to t[s, q, c] == e[s, q] * x[s, c] / (1 + z[s])
+# Linearized as xe[s, q, c] == t[s, q, c] + tz[s, q, c] using the above
+for s, q, c in SxQxC:
+    add_row({xe[s, q, c]: 1, t[s, q, c]: -1, tz[s, q, c]: -1}, 0, 0)
+
+
+# Objective
+# Minimize sum of volumes across all belts simultaneously
+for col in v.values():
+    system.changeColCost(col, 1)
+
+
+# Solve the system
+system.run()
+status = system.modelStatusToString(system.getModelStatus()).lower()
+print(f"Termination condition: {status}")
+feasible = highspy.SolutionStatus.kSolutionStatusFeasible
+if system.getInfo().primal_solution_status != feasible:
+    raise RuntimeError(
+        f"A feasible solution was not found (HiGHS status: {status}), "
+        "so no solution can be loaded."
+    )
+
+
+# Print the solution in a friendly way
+solution = system.getSolution().col_value
+print()
+print("Belt connections in solution:")
+for p, q in B:
+    if solution[e[p, q]] > 0.5:
+        volume = solution[v[p, q]]
+        print(f"    {p[0]}{p[1]} -> {q[0]}{q[1]}    v = {volume:.8f}")
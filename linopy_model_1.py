@@ -0,0 +1,300 @@
+import highspy
+import linopy
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+assert highspy is not None
+
+
+# Desired belt balancer values for generating the model
+inbounds = 8  # Number of inbound belts
+outbounds = 8  # Number of outbound belts
+splitters = 10  # Number of splitters allowed
+
+
+# Derived values for inbound and outbound traffic
+cargos = inbounds  # One unique homogeneous cargo type for each inbound belt
+throughput = min(inbounds, outbounds)  # Number of belts of throughput
+v_in = throughput / inbounds  # Total volume per inbound belt
+v_out = throughput / outbounds  # Total volume per outbound belt
+t_in = v_in / 1  # Inbound traffic per cargo per belt (homogeneous)
+t_out = v_out / cargos  # Outbound traffic per cargo per belt
+
+
+model = linopy.Model()
+
+
+# Functions for set utility operations
+def init_set(letter, size):
+    return [f"{letter}{x+1}" for x in range(size)]
+
+
+# Basic sets
+I = init_set('i', inbounds)  # Inbound belts to the balancer
+J = init_set('j', outbounds)  # Outbound belts from the balancer
+S = init_set('s', splitters)  # Splitters within the balancer
+C = init_set('c', cargos)  # A unique cargo type for each inbound belt
+
+
+# Composite sets, as coordinates along each array dimension
+P = pd.Index(I + S, name='p')  # Every possible producing end of a belt
+Q = pd.Index(S + J, name='q')  # Every possible consuming end of a belt
+SS = pd.Index(S, name='s')  # Splitters, when indexed on their own
+CC = pd.Index(C, name='c')  # Cargo types
+
+# Available belt routes within the balancer, as a mask over P x Q
+# Belts may not bypass the splitters entirely (no I x J routes)
+# A splitter may not loop right back on itself (no s_k -> s_k routes)
+B = xr.DataArray(
+    [[not (p in I and q in J) and p != q for q in Q] for p in P],
+    coords=[P, Q],
+)
+BxC = B.expand_dims(c=CC)  # Internal belts and cargo types
+
+# Belts that start at the output of a splitter, as a mask over S x Q
+W = B.sel(p=S).rename(p='s')
+WxC = W.expand_dims(c=CC)  # Splitter output belts and cargo types
+
+
+# Parameters
+
+# Homogeneous cargo traffic for each inbound belt
+f = xr.DataArray(
+    t_in * np.eye(inbounds, cargos),
+    coords=[pd.Index(I, name='p'), CC],
+)
+
+# Perfectly mixed cargo traffic for each outbound belt
+g = t_out
+
+# Upper bound on the traffic flowing along any belt
+u_t = 1
+
+# Upper bound on the traffic flowing into any splitter
+# Two full input belts, and no tighter: feedback loops can carry more than
+# t_in of a single cargo into a splitter
+u_x = 2
+
+
+# Variables
+e = model.add_variables(
+    coords=[P, Q],
+    binary=True,
+    mask=B,
+    name='e',
+)  # Decision variable indicating whether a belt exists
+t = model.add_variables(
+    lower=0,
+    upper=1,
+    coords=[P, Q, CC],
+    mask=BxC,
+    name='t',
+)  # Fraction of belt capacity occupied by one cargo type
+v = model.add_variables(
+    lower=0,
+    upper=1,
+    coords=[P, Q],
+    mask=B,
+    name='v',
+)  # Total occupied fraction of belt capacity
+n = model.add_variables(
+    lower=0,
+    coords=[SS],
+    integer=True,
+    name='n',
+)  # Number of belts running into each splitter
+m = model.add_variables(
+    lower=0,
+    coords=[SS],
+    integer=True,
+    name='m',
+)  # Number of belts running out of each splitter
+x = model.add_variables(
+    lower=0,
+    upper=u_x,
+    coords=[SS, CC],
+    name='x',
+)  # Sum of traffic flowing into each splitter by cargo
+y = model.add_variables(
+    lower=0,
+    upper=u_x,
+    coords=[SS, CC],
+    name='y',
+)  # Sum of traffic flowing out of each splitter by cargo
+z = model.add_variables(
+    coords=[SS],
+    binary=True,
+    name='z',
+)  # Indicator variable for splitters that have two outputs
+xe = model.add_variables(
+    lower=0,
+    coords=[SS, Q, CC],
+    mask=WxC,
+    name='xe',
+)  # Product of the variables x[s, c] and e[s, q]
+tz = model.add_variables(
+    lower=0,
+    upper=1,
+    coords=[SS, Q, CC],
+    mask=WxC,
+    name='tz',
+)  # Product of the variables t[s, q, c] and z[s]
+
+# Views of e and t restricted to belts that start at a splitter output
+# Masked slots are filled with 0 before combining variables in one
+# expression, so the constraints don't depend on linopy's missing-value rules
+e_w = e.sel(p=S).rename(p='s').fillna(0)
+t_w = t.sel(p=S).rename(p='s').fillna(0)
+
+
+# Volume definition constraint
+# Define belt volume as the sum over all cargo
+model.add_constraints(
+    v.fillna(0) == t.sum('c'),
+    mask=B,
+    name='define_volume',
+)
+
+
+# Constraints defining number of splitter input/output belts
+
+# Define the number of input belts to a splitter with a sum
+model.add_constraints(
+    n == e.sel(q=S).sum('p').rename(q='s'),
+    name='define_num_inputs',
+)
+
+# Define the number of output belts to a splitter with a sum
+model.add_constraints(
+    m == e.sel(p=S).sum('q').rename(p='s'),
+    name='define_num_outputs',
+)
+
+
+# Constraints defining splitter inflow/outflow traffic by cargo
+
+# Define splitter inflow as the sum over all input belts
+model.add_constraints(
+    x == t.sel(q=S).sum('p').rename(q='s'),
+    name='define_inflow',
+)
+
+# Define splitter outflow as the sum over all output belts
+model.add_constraints(
+    y == t.sel(p=S).sum('q').rename(p='s'),
+    name='define_outflow',
+)
+
+
+# Trick constraints to force xe[s, q, c] == x[s, c] * e[s, q]
+# See section 7.7 of the AIMMS PDF in this directory for more details
+model.add_constraints(xe.fillna(0) <= u_x * e_w, mask=WxC, name='force_xe_1')
+model.add_constraints(xe.fillna(0) <= x, mask=WxC, name='force_xe_2')
+model.add_constraints(
+    xe.fillna(0) - x - u_x * e_w >= -u_x,
+    mask=WxC,
+    name='force_xe_3',
+)
+
+
+# Trick constraints to force tz[s, q, c] == t[s, q, c] * z[s]
+# See section 7.7 of the AIMMS PDF in this directory for more details
+model.add_constraints(tz.fillna(0) <= u_t * z, mask=WxC, name='force_tz_1')
+model.add_constraints(tz.fillna(0) <= t_w, mask=WxC, name='force_tz_2')
+model.add_constraints(
+    tz.fillna(0) - t_w - u_t * z >= -u_t,
+    mask=WxC,
+    name='force_tz_3',
+)
+
+
+# Inbound/outbound connectedness constraints
+
+# Balancer must connect all inbound belts exactly once
+model.add_constraints(e.sel(p=I).sum('q') == 1, name='connect_inbounds')
+
+# Balancer must connect all outbound belts exactly once
+model.add_constraints(e.sel(q=J).sum('p') == 1, name='connect_outbounds')
+
+
+# Inbound/outbound balanced traffic constraints
+
+# Balancer must consume all inbound traffic
+model.add_constraints(t.sel(p=I).sum('q') == f, name='consume_inbounds')
+
+# Balancer must produce expected outbound traffic
+model.add_constraints(t.sel(q=J).sum('p') == g, name='produce_outbounds')
+
+
+# Belt capacity/connectedness constraint
+# Ensure belt volume is limited by capacity and connectedness
+model.add_constraints(
+    v.fillna(0) <= e.fillna(0),
+    mask=B,
+    name='respect_capacity',
+)
+
+
+# Splitter cargo conservation constraint
+# Splitters do not create cargo or destroy cargo
+model.add_constraints(x == y, name='splitters_conserve')
+
+
+# Splitter connectedness constraints
+
+# Splitters with two output belts should have at least one input belt
+model.add_constraints(n >= z, name='min_inputs')
+
+# Splitters can take at most two input belts
+model.add_constraints(n <= 2, name='max_inputs')
+
+# Splitters that are actually splitting must have two output belts
+model.add_constraints(m >= 2 * z, name='min_outputs')
+
+# Splitters have one output belt unless they are actually splitting
+model.add_constraints(m <= 1 + z, name='max_outputs')
+
+
+# Splitter symmetry breaking constraint
+# Splitters are interchangeable, so relabeling them gives an equivalent
+# balancer that the solver would otherwise have to explore separately
+# Number splitters in order of decreasing number of input belts
+model.add_constraints(
+    n <= n.shift(s=1).fillna(0),
+    mask=xr.DataArray([s != S[0] for s in S], coords=[SS]),
+    name='order_splitters',
+)
+
+
+# Constraint so that splitters split evenly
+# By far the most complex constraint here (because it's not actually linear)
+# Supposed to be equivalent to t[s, q, c] == e[s, q] * x[s, c] / (1 + z[s])
+# Splitters split their total input evenly to their outputs
+model.add_constraints(
+    xe.fillna(0) == t_w + tz.fillna(0),
+    mask=WxC,
+    name='split_evenly',
+)
+
+
+# Objective
+# Minimize sum of volumes across all belts simultaneously
+model.add_objective(v.sum(), sense='min')
+
+
+# Solve the model
+status, condition = model.solve(solver_name="highs")
+print(status, condition)
+
+
+# Print the solution in a friendlier way
+print()
+print("Belt connections in solution:")
+e_sol = e.solution.fillna(0)
+v_sol = v.solution.fillna(0)
+for p in P:
+    for q in Q:
+        if e_sol.loc[p, q] > 0.5:
+            print(f"    {p} -> {q}    v = {float(v_sol.loc[p, q]):.8f}")
@@ -1,4 +1,5 @@
-import string
+import os
+import tempfile
 
 import highspy
 import pyomo.environ as pyo
@@ -13,6 +14,18 @@ inbounds = 8  # Number of inbound belts
 outbounds = 8  # Number of outbound belts
 splitters = 10  # Number of splitters allowed
 
+# Large splitter counts are still solved as one model, not in slices
+# Every outbound belt must mix every cargo, so no group of splitters is
+# independent of the rest of the balancer
+
+
+# Output options
+verbose = False  # Print the entire model and every solution variable
+
+
+# Solver options
+file_solve_min_rows = 5000  # Solve models this large through an LP file
+
 
 # Derived values for inbound and outbound traffic
 cargos = inbounds  # One unique homogeneous cargo type for each inbound belt
@@ -23,16 +36,15 @@ t_in = v_in / 1  # Inbound traffic per cargo per belt (homogeneous)
 t_out = v_out / cargos  # Outbound traffic per cargo per belt
 
 
+# The model is rebuilt on every run rather than pickled to disk
+# Building takes under a tenth of a second at 8/8/10, no faster to unpickle,
+# and a cached copy would silently go stale whenever this file changes
 model = pyo.ConcreteModel()
 
 
 # Functions for set utility operations
 def init_set(letter, size):
     return [f"{letter}{x+1}" for x in range(size)]
-def get_letter(member):
-    return member.rstrip(string.digits)
-def get_int(member):
-    return int(member.lstrip(string.ascii_letters))
 
 
 # Basic sets
@@ -48,6 +60,9 @@ model.S = pyo.Set(
     doc="Splitters within the balancer",
     initialize=init_set('s', splitters),
 )
+# Cargo types look symmetric, but they can't be aggregated into one flow
+# Each one enters on its own inbound belt, and tracking them separately is
+# exactly what lets us require every outbound belt to be perfectly mixed
 model.C = pyo.Set(
     doc="A unique cargo type for each inbound belt",
     initialize=init_set('c', cargos),
@@ -63,54 +78,64 @@ model.Q = pyo.Set(
     doc="Every possible consuming end of a belt",
     initialize=model.S | model.J,  # Union
 )
-def B_filter(model, p, q):
-    if get_letter(p) == 'i' and get_letter(q) == 'j':
-        return False  # Don't allow belts that bypass the splitters entirely
-    if get_letter(p) == get_letter(q) == 's' and get_int(p) == get_int(q):
-        return False  # Don't allow a splitter to loop right back on itself
-    return True
+def B_init(model):
+    # Enumerate allowed routes directly rather than filtering P x Q
+    # Belts may not bypass the splitters entirely (no I x J routes)
+    # A splitter may not loop right back on itself (no s_k -> s_k routes)
+    return (
+        [(i, s) for i in model.I for s in model.S]
+        + [(s, j) for s in model.S for j in model.J]
+        + [(s, r) for s in model.S for r in model.S if s != r]
+    )
 model.B = pyo.Set(
     doc="Available belt routes within the balancer",
-    initialize=model.P * model.Q,  # Cartesian product
-    filter=B_filter,
+    initialize=B_init,
 )
+# Adjacency lists of the belt routes, so rules need not scan all of B
+succs = {p: [] for p in model.P}  # Consuming ends reachable from each p
+preds = {q: [] for q in model.Q}  # Producing ends that can reach each q
+for p, q in model.B:
+    succs[p].append(q)
+    preds[q].append(p)
 model.IxC = pyo.Set(
     doc="Cartesian product of inbound belts and cargo types",
-    initialize=model.I * model.C,
+    initialize=[(i, c) for i in model.I for c in model.C],
 )
 model.JxC = pyo.Set(
     doc="Cartesian product of outbound belts and cargo types",
-    initialize=model.J * model.C,
+    initialize=[(j, c) for j in model.J for c in model.C],
 )
 model.SxC = pyo.Set(
     doc="Cartesian product of splitters and cargo types",
-    initialize=model.S * model.C,
+    initialize=[(s, c) for s in model.S for c in model.C],
 )
 model.BxC = pyo.Set(
     doc="Cartesian product of internal belts and cargo types",
-    initialize=model.B * model.C,
+    initialize=[(p, q, c) for p, q in model.B for c in model.C],
 )
+def W_init(model):
+    return [(s, q) for s in model.S for q in succs[s]]
 model.W = pyo.Set(
     doc="Belts that start at the output of a splitter",
-    initialize=(model.S * model.Q) & model.B,  # Intersection
-    within=model.B,
+    initialize=W_init,
 )
 model.WxC = pyo.Set(
     doc="Cartesian product of splitter output belts and cargo types",
-    initialize=model.W * model.C,
-    within=model.BxC,
+    initialize=[(s, q, c) for s, q in model.W for c in model.C],
 )
 
 
 # Parameters
-def f_init(model, i, c):
-    if get_int(i) == get_int(c):
-        return t_in
-    return 0
+# Each inbound belt carries the cargo paired with it by position in the sets
+f_data = {
+    (i, c): t_in
+    for i, c in zip(init_set('i', inbounds), init_set('c', cargos))
+}
 model.f = pyo.Param(
     model.IxC,
     domain=pyo.PercentFraction,
-    initialize=f_init,
+    initialize=f_data,
+    default=0,
     doc="Homogeneous cargo traffic for each inbound belt",
 )
 model.g = pyo.Param(
@@ -124,12 +149,21 @@ model.u_t = pyo.Param(
     default=1,
     doc="Upper bound on the traffic flowing along any belt",
 )
+# Two full input belts, and no tighter: feedback loops can carry more than
+# t_in of a single cargo into a splitter
 model.u_x = pyo.Param(
     domain=pyo.PositiveReals,
     default=2,
     doc="Upper bound on the traffic flowing into any splitter",
 )
 
+# Plain Python copies of the parameters for use inside constraint rules
+# Pyomo Param lookups are comparatively slow and wrap every constant
+f = model.f.extract_values()
+g = model.g.extract_values()
+u_t = pyo.value(model.u_t)
+u_x = pyo.value(model.u_x)
+
 
 # Variables
 model.e = pyo.Var(
@@ -160,11 +194,13 @@ model.m = pyo.Var(
 model.x = pyo.Var(
     model.SxC,
     domain=pyo.NonNegativeReals,
+    bounds=(0, u_x),
     doc="Sum of traffic flowing into each splitter by cargo",
 )
 model.y = pyo.Var(
     model.SxC,
     domain=pyo.NonNegativeReals,
+    bounds=(0, u_x),
     doc="Sum of traffic flowing out of each splitter by cargo",
 )
 model.z = pyo.Var(
@@ -186,7 +222,7 @@ model.tz = pyo.Var(
 
 # Volume definition constraint
 def define_volume_rule(model, p, q):
-    return model.v[p, q] == sum(model.t[p, q, c] for c in model.C)
+    return model.v[p, q] == pyo.quicksum(model.t[p, q, c] for c in model.C)
 model.define_volume = pyo.Constraint(
     model.B,
     rule=define_volume_rule,
@@ -196,14 +232,14 @@ model.define_volume = pyo.Constraint(
 
 # Constraints defining number of splitter input/output belts
 def define_num_inputs_rule(model, s):
-    return model.n[s] == sum(model.e[p, q] for p, q in model.B if q == s)
+    return model.n[s] == pyo.quicksum(model.e[p, s] for p in preds[s])
 model.define_num_inputs = pyo.Constraint(
     model.S,
     rule=define_num_inputs_rule,
     doc="Define the number of input belts to a splitter with a sum",
 )
 def define_num_outputs_rule(model, s):
-    return model.m[s] == sum(model.e[p, q] for p, q in model.B if p == s)
+    return model.m[s] == pyo.quicksum(model.e[s, q] for q in succs[s])
 model.define_num_outputs = pyo.Constraint(
     model.S,
     rule=define_num_outputs_rule,
@@ -213,14 +249,14 @@ model.define_num_outputs = pyo.Constraint(
 
 # Constraints defining splitter inflow/outflow traffic by cargo
 def define_inflow_rule(model, s, c):
-    return model.x[s, c] == sum(model.t[p, q, c] for p, q in model.B if q == s)
+    return model.x[s, c] == pyo.quicksum(model.t[p, s, c] for p in preds[s])
 model.define_inflow = pyo.Constraint(
     model.SxC,
     rule=define_inflow_rule,
     doc="Define splitter inflow as the sum over all input belts",
 )
 def define_outflow_rule(model, s, c):
-    return model.y[s, c] == sum(model.t[p, q, c] for p, q in model.B if p == s)
+    return model.y[s, c] == pyo.quicksum(model.t[s, q, c] for q in succs[s])
 model.define_outflow = pyo.Constraint(
     model.SxC,
     rule=define_outflow_rule,
@@ -230,8 +266,11 @@ model.define_outflow = pyo.Constraint(
 
 # Trick constraints to force xe[s, q, c] == x[s, c] * e[s, q]
 # See section 7.7 of the AIMMS PDF in this directory for more details
+# These and the tz rows below are all added up front rather than lazily
+# HiGHS never calls its lazy constraint callback, and separating the rows
+# in an outer solve/check/re-solve loop instead was about 20x slower
 def force_xe_1_rule(model, s, q, c):
-    return model.xe[s, q, c] <= model.u_x * model.e[s, q]
+    return model.xe[s, q, c] <= u_x * model.e[s, q]
 model.force_xe_1 = pyo.Constraint(
     model.WxC,
     rule=force_xe_1_rule,
@@ -245,7 +284,7 @@ model.force_xe_2 = pyo.Constraint(
     doc="Second inequality to force xe[s, q, c] == x[s, c] * e[s, q]",
 )
 def force_xe_3_rule(model, s, q, c):
-    return model.xe[s, q, c] >= model.x[s, c] - model.u_x * (1 - model.e[s, q])
+    return model.xe[s, q, c] >= model.x[s, c] - u_x * (1 - model.e[s, q])
 model.force_xe_3 = pyo.Constraint(
     model.WxC,
     rule=force_xe_3_rule,
@@ -256,7 +295,7 @@ model.force_xe_3 = pyo.Constraint(
 # Trick constraints to force tz[s, q, c] == t[s, q, c] * z[s]
 # See section 7.7 of the AIMMS PDF in this directory for more details
 def force_tz_1_rule(model, s, q, c):
-    return model.tz[s, q, c] <= model.u_t * model.z[s]
+    return model.tz[s, q, c] <= u_t * model.z[s]
 model.force_tz_1 = pyo.Constraint(
     model.WxC,
     rule=force_tz_1_rule,
@@ -270,7 +309,7 @@ model.force_tz_2 = pyo.Constraint(
     doc="Second inequality to force tz[s, q, c] == t[s, q, c] * z[s]"
 )
 def force_tz_3_rule(model, s, q, c):
-    return model.tz[s, q, c] >= model.t[s, q, c] - model.u_t * (1 - model.z[s])
+    return model.tz[s, q, c] >= model.t[s, q, c] - u_t * (1 - model.z[s])
 model.force_tz_3 = pyo.Constraint(
     model.WxC,
     rule=force_tz_3_rule,
@@ -280,14 +319,14 @@ model.force_tz_3 = pyo.Constraint(
 
 # Inbound/outbound connectedness constraints
 def connect_inbounds_rule(model, i):
-    return sum(model.e[p, q] for p, q in model.B if p == i) == 1
+    return pyo.quicksum(model.e[i, q] for q in succs[i]) == 1
 model.connect_inbounds = pyo.Constraint(
     model.I,
     rule=connect_inbounds_rule,
     doc="Balancer must connect all inbound belts exactly once",
 )
 def connect_outbounds_rule(model, j):
-    return sum(model.e[p, q] for p, q in model.B if q == j) == 1
+    return pyo.quicksum(model.e[p, j] for p in preds[j]) == 1
 model.connect_outbounds = pyo.Constraint(
     model.J,
     rule=connect_outbounds_rule,
@@ -297,14 +336,14 @@ model.connect_outbounds = pyo.Constraint(
 
 # Inbound/outbound balanced traffic constraints
 def consume_inbounds_rule(model, i, c):
-    return sum(model.t[p, q, c] for p, q in model.B if p == i) == model.f[i, c]
+    return pyo.quicksum(model.t[i, q, c] for q in succs[i]) == f[i, c]
 model.consume_inbounds = pyo.Constraint(
     model.IxC,
     rule=consume_inbounds_rule,
     doc="Balancer must consume all inbound traffic",
 )
 def produce_outbounds_rule(model, j, c):
-    return sum(model.t[p, q, c] for p, q in model.B if q == j) == model.g[j, c]
+    return pyo.quicksum(model.t[p, j, c] for p in preds[j]) == g[j, c]
 model.produce_outbounds = pyo.Constraint(
     model.JxC,
     rule=produce_outbounds_rule,
@@ -363,6 +402,20 @@ model.max_outputs = pyo.Constraint(
 )
 
 
+# Splitter symmetry breaking constraint
+# Splitters are interchangeable, so relabeling them gives an equivalent
+# balancer that the solver would otherwise have to explore separately
+def order_splitters_rule(model, s):
+    if s == model.S.first():
+        return pyo.Constraint.Skip
+    return model.n[s] <= model.n[model.S.prev(s)]
+model.order_splitters = pyo.Constraint(
+    model.S,
+    rule=order_splitters_rule,
+    doc="Number splitters in order of decreasing number of input belts",
+)
+
+
 # Constraint so that splitters split evenly
 # By far the most complex constraint here (because it's not actually linear)
 # Supposed to be equivalent to t[s, q, c] == e[s, q] * x[s, c] / (1 + z[s])
@@ -376,41 +429,82 @@ model.split_evenly = pyo.Constraint(
 
 
 # Objective
-def simultaneous_volume_rule(model):
-    return sum(model.v[p, q] for p, q in model.B)
 model.simultaneous_volume = pyo.Objective(
-    rule=simultaneous_volume_rule,
+    expr=pyo.quicksum(model.v.values()),
     sense=pyo.minimize,
     doc="Minimize sum of volumes across all belts simultaneously",
 )
 
 
 # Print entire prepared model
-model.pprint()
+if verbose:
+    model.pprint()
 
 
 # Solve the model
-results = opt.SolverFactory("appsi_highs").solve(model)
-results.write()
+# No MIP start is given: the obvious greedy design (i_k -> s_k -> j_k)
+# never mixes cargo, so it breaks produce_outbounds and HiGHS would reject it
+if model.nconstraints() >= file_solve_min_rows:
+    # Writing an LP file and letting HiGHS read it in bulk skips appsi's
+    # term-by-term transfer, which saves about 0.2s at the default 8/8/10
+    # That is small next to a solve taking minutes, but it is free here
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename, symbol_map_id = model.write(
+            os.path.join(tmpdir, "model.lp"),
+            io_options={"symbolic_solver_labels": True},
+        )
+        solver = highspy.Highs()
+        solver.setOptionValue("output_flag", verbose)
+        solver.readModel(filename)
+    solver.run()
+    status = solver.modelStatusToString(solver.getModelStatus()).lower()
+    feasible = highspy.SolutionStatus.kSolutionStatusFeasible
+    if solver.getInfo().primal_solution_status != feasible:
+        raise RuntimeError(
+            f"A feasible solution was not found (HiGHS status: {status}), "
+            "so no solution can be loaded."
+        )
+
+    # Load the solution back into the Pyomo variables by column name
+    symbol_map = model.solutions.symbol_map[symbol_map_id]
+    values = solver.getSolution().col_value
+    for col, value in enumerate(values):
+        var = symbol_map.bySymbol.get(solver.getColName(col)[1])
+        if var is not None:
+            var.set_value(value, skip_validation=True)
+else:
+    # Smaller models go through the appsi interface instead
+    # The default 8/8/10 instance is big enough to take the LP file path
+    # The appsi solver is persistent, so calling solver.solve(model) again
+    # after an edit only pushes the changed components to HiGHS
+    solver = opt.SolverFactory("appsi_highs")
+    results = solver.solve(model)
+    status = str(results.solver.termination_condition)
+    if verbose:
+        results.write()
+print(f"Termination condition: {status}")
 
 
 # Print the solution variables
-print('', 60 * '=', 'BELT BALANCER SOLUTION', 60 * '=', '', sep='\n')
-model.e.display()
-model.t.display()
-model.v.display()
-model.n.display()
-model.m.display()
-model.x.display()
-model.y.display()
-model.z.display()
-model.xe.display()
-model.tz.display()
+if verbose:
+    print('', 60 * '=', 'BELT BALANCER SOLUTION', 60 * '=', '', sep='\n')
+    model.e.display()
+    model.t.display()
+    model.v.display()
+    model.n.display()
+    model.m.display()
+    model.x.display()
+    model.y.display()
+    model.z.display()
+    model.xe.display()
+    model.tz.display()
 
 # Print the solution in a friendlier way
 print()
 print("Belt connections in solution:")
-for p, q in model.B:
-    if pyo.value(model.e[p, q]) > 0.5:
-        v = pyo.value(model.v[p, q])
-        print(f"    {p} -> {q}    v = {v:.8f}")
+e_values = model.e.extract_values()
+v_values = model.v.extract_values()
+print('\n'.join(
+    f"    {p} -> {q}    v = {v_values[p, q]:.8f}"
+    for (p, q), e in e_values.items() if e > 0.5
+))